@@ -1,31 +1,30 @@
 import os
+import contextlib
 import datetime
 import logging
 import json
+import mmap
 import re
+import uuid
+import numpy as np
 import pandas as pd
-from barcode import Code128
-from barcode.writer import ImageWriter
-from reportlab.pdfgen import canvas
-from reportlab.lib.pagesizes import letter
-from flask import Flask, render_template, request, jsonify, send_file, session, redirect, url_for, flash
-
-# --- Application and Logging Configuration ---
-app = Flask(__name__)
-app.secret_key = 'supersecretkey'  # Change this for production
-
-# Record the app start time for uptime calculation
-app_start_time = datetime.datetime.now()
-
-# Configure logging: All messages will be written to app.log
-logging.basicConfig(
-    level=logging.INFO,
-    filename='app.log',
-    format='%(asctime)s %(levelname)s: %(message)s'
-)
+from flask import Blueprint, Flask, current_app, render_template, request, jsonify, send_file, session, redirect, url_for, flash
+
+try:
+    import fcntl  # Serializes inventory generation builds across workers (POSIX only).
+except ImportError:
+    fcntl = None
+
+# Label-generation dependencies (python-barcode, Pillow, reportlab) are imported
+# lazily inside generate_barcodes() so that worker startup does not pay for them.
+
+# --- Blueprint ---
+# All routes are registered on this blueprint; create_app() attaches it to an app.
+main = Blueprint('main', __name__)
 
 # --- Global Variables & Directories ---
-inventory_dataframe = pd.DataFrame()  # Combined reference inventory DataFrame
+# Memory-mapped reference inventory generation. None until first used; use get_inventory().
+inventory_generation = None
 # scanned_dataframe holds the active campaign's scan log.
 scanned_dataframe = pd.DataFrame(columns=[
     "barcode", "timestamp", "building", "room", "location", "category"
@@ -36,10 +35,8 @@ DATA_DIRECTORY = os.path.join(BASE_DIRECTORY, "data")
 CAMPAIGNS_DIRECTORY = os.path.join(BASE_DIRECTORY, "campaigns")
 UPLOADS_DIRECTORY = os.path.join(BASE_DIRECTORY, "uploads")
 CONFIGURATION_FILE = os.path.join(BASE_DIRECTORY, "config.json")  # Configuration file
-
-# Ensure required folders exist
-for folder in [DATA_DIRECTORY, CAMPAIGNS_DIRECTORY, UPLOADS_DIRECTORY]:
-    os.makedirs(folder, exist_ok=True)
+GENERATIONS_DIRECTORY = os.path.join(BASE_DIRECTORY, "inventory_generations")  # Shared inventory generations
+CURRENT_GENERATION_FILE = os.path.join(GENERATIONS_DIRECTORY, "CURRENT")
 
 # --- Configuration Handling ---
 CONFIGURATION = {}
@@ -62,37 +59,304 @@ def save_configuration():
         json.dump(CONFIGURATION, file)
     logging.info("Saved updated config file.")
 
-# Load configuration on startup.
-load_configuration()
+# --- Shared Inventory Generations ---
+# The reference inventory is stored as versioned, read-only generation files that
+# every gunicorn worker memory-maps, so all workers share a single copy in RAM.
+# CURRENT names the live generation and its build id. load_inventory() writes a new
+# generation and repoints CURRENT; each worker switches to it on its next call to
+# get_inventory(). Workers compare build ids rather than generation numbers, so a
+# rebuilt GENERATIONS_DIRECTORY whose numbering restarts is still picked up.
+
+GENERATION_MAGIC = b"CHEMINV1"
+GENERATION_ALIGNMENT = 64
+
+def _align(position):
+    return -(-position // GENERATION_ALIGNMENT) * GENERATION_ALIGNMENT
+
+class InventoryGeneration:
+    """
+    Zero-copy, read-only view of one inventory generation file.
+
+    Each column is either a numeric array or UTF-8 text stored as an offsets
+    array, a byte buffer and a null mask. The barcode index holds the sorted
+    "Barcode ID - Container" keys and their row numbers. An InventoryGeneration
+    created without a path is empty.
+    """
+
+    def __init__(self, path=None):
+        self.path = path
+        self.generation = 0
+        self.build_id = None
+        self.source = []
+        self.columns = []
+        self.row_count = 0
+        self.unique_barcode_count = 0
+        self._columns = {}
+        self._index_keys = None
+        self._index_rows = None
+        if path is None:
+            return
+
+        with open(path, 'rb') as file:
+            self._buffer = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        if self._buffer[:len(GENERATION_MAGIC)] != GENERATION_MAGIC:
+            raise ValueError(f"{path} is not an inventory generation file.")
+        header_length = int.from_bytes(self._buffer[8:16], 'little')
+        header = json.loads(self._buffer[16:16 + header_length])
+        self._base = _align(16 + header_length)
+
+        self.generation = header["generation"]
+        self.build_id = header["build_id"]
+        self.source = header["source"]
+        self.row_count = header["rows"]
+        self.unique_barcode_count = header["unique_barcodes"]
+        for column in header["columns"]:
+            self.columns.append(column["name"])
+            if column["kind"] == "numeric":
+                self._columns[column["name"]] = ("numeric", self._array(column["values"], column["dtype"]))
+            else:
+                self._columns[column["name"]] = (
+                    "text",
+                    self._array(column["offsets"], np.int64),
+                    self._array(column["data"], np.uint8),
+                    self._array(column["nulls"], np.bool_),
+                )
+        index = header["index"]
+        if index is not None:
+            self._index_keys = self._array(index["keys"], f"S{index['width']}")
+            self._index_rows = self._array(index["rows"], np.int64)
+
+    def _array(self, block, dtype):
+        offset, size = block
+        dtype = np.dtype(dtype)
+        return np.frombuffer(self._buffer, dtype=dtype, count=size // dtype.itemsize, offset=self._base + offset)
+
+    @property
+    def empty(self):
+        return self.row_count == 0
+
+    def row(self, position):
+        """Return one inventory row as a dict keyed by column name."""
+        record = {}
+        for name in self.columns:
+            kind, *arrays = self._columns[name]
+            if kind == "numeric":
+                record[name] = arrays[0][position].item()
+            else:
+                offsets, data, nulls = arrays
+                if nulls[position]:
+                    record[name] = None
+                else:
+                    record[name] = data[offsets[position]:offsets[position + 1]].tobytes().decode('utf-8')
+        return record
+
+    def lookup(self, barcode):
+        """Return all rows whose "Barcode ID - Container" matches barcode, in file order."""
+        if self._index_keys is None:
+            return []
+        key = barcode.encode('utf-8')
+        if len(key) > self._index_keys.dtype.itemsize:
+            return []
+        start = np.searchsorted(self._index_keys, key, side='left')
+        stop = np.searchsorted(self._index_keys, key, side='right')
+        return [self.row(int(position)) for position in self._index_rows[start:stop]]
+
+    def to_records(self):
+        """Return every inventory row as a list of dicts (like DataFrame.to_dict(orient='records'))."""
+        column_values = []
+        for name in self.columns:
+            kind, *arrays = self._columns[name]
+            if kind == "numeric":
+                column_values.append(arrays[0].tolist())
+            else:
+                offsets, data, nulls = arrays
+                offsets = offsets.tolist()
+                data = data.tobytes()
+                column_values.append([
+                    None if null else data[offsets[position]:offsets[position + 1]].decode('utf-8')
+                    for position, null in enumerate(nulls.tolist())
+                ])
+        return [dict(zip(self.columns, values)) for values in zip(*column_values)]
+
+def _generation_path(generation):
+    return os.path.join(GENERATIONS_DIRECTORY, f"inventory-{generation:06d}.bin")
+
+def _read_current_generation():
+    """Return the (generation, build_id) named by CURRENT, or None if there is none."""
+    try:
+        with open(CURRENT_GENERATION_FILE, "r") as file:
+            generation, build_id = file.read().split()
+        return int(generation), build_id
+    except (OSError, ValueError):
+        return None
+
+def _inventory_source():
+    """Describe the CSV files a generation is built from, to detect stale generations."""
+    source = []
+    for file in sorted(os.listdir(DATA_DIRECTORY)):
+        if file.endswith('.csv'):
+            file_status = os.stat(os.path.join(DATA_DIRECTORY, file))
+            source.append([file, file_status.st_size, file_status.st_mtime_ns])
+    return source
+
+@contextlib.contextmanager
+def _generation_lock():
+    """Serialize generation builds across worker processes (where fcntl is available)."""
+    with open(os.path.join(GENERATIONS_DIRECTORY, "build.lock"), "a") as lock_file:
+        if fcntl is not None:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+        yield
+
+def _write_inventory_generation(dataframe, generation, build_id, source, path):
+    """Write dataframe as a generation file at path, atomically."""
+    blocks = []
+    position = 0
+
+    def add_block(array):
+        nonlocal position
+        data = np.ascontiguousarray(array).tobytes()
+        blocks.append((position, data))
+        block = [position, len(data)]
+        position = _align(position + len(data))
+        return block
+
+    columns = []
+    for name in dataframe.columns:
+        column = dataframe[name]
+        values = column.to_numpy()
+        if values.dtype.kind in "biuf":
+            columns.append({"name": str(name), "kind": "numeric", "dtype": values.dtype.str, "values": add_block(values)})
+            continue
+        nulls = column.isna().to_numpy(dtype=np.bool_)
+        encoded = [b"" if null else str(value).encode('utf-8') for value, null in zip(column.tolist(), nulls)]
+        offsets = np.zeros(len(encoded) + 1, dtype=np.int64)
+        np.cumsum([len(value) for value in encoded], out=offsets[1:])
+        columns.append({
+            "name": str(name),
+            "kind": "text",
+            "offsets": add_block(offsets),
+            "data": add_block(np.frombuffer(b"".join(encoded), dtype=np.uint8)),
+            "nulls": add_block(nulls),
+        })
+
+    index = None
+    unique_barcodes = 0
+    if not dataframe.empty and "Barcode ID - Container" in dataframe.columns:
+        barcodes = dataframe["Barcode ID - Container"]
+        # Missing barcodes are indexed as "nan", matching the original astype(str) lookup.
+        keys = np.array([
+            b"nan" if null else str(value).encode('utf-8')
+            for value, null in zip(barcodes.tolist(), barcodes.isna().tolist())
+        ])
+        order = np.argsort(keys, kind='stable')
+        index = {
+            "keys": add_block(keys[order]),
+            "width": keys.dtype.itemsize,
+            "rows": add_block(order.astype(np.int64)),
+        }
+        unique_barcodes = int(barcodes.nunique())
+
+    header = json.dumps({
+        "generation": generation,
+        "build_id": build_id,
+        "source": source,
+        "rows": len(dataframe),
+        "unique_barcodes": unique_barcodes,
+        "columns": columns,
+        "index": index,
+    }).encode('utf-8')
+    base = _align(16 + len(header))
+
+    temporary_path = f"{path}.{os.getpid()}.tmp"
+    with open(temporary_path, "wb") as file:
+        file.write(GENERATION_MAGIC)
+        file.write(len(header).to_bytes(8, 'little'))
+        file.write(header)
+        for offset, data in blocks:
+            file.write(b"\0" * (base + offset - file.tell()))
+            file.write(data)
+    os.replace(temporary_path, path)
+
+def _publish_generation(generation, build_id):
+    """Point CURRENT at generation and remove generations no worker should still open."""
+    temporary_path = f"{CURRENT_GENERATION_FILE}.{os.getpid()}.tmp"
+    with open(temporary_path, "w") as file:
+        file.write(f"{generation} {build_id}")
+    os.replace(temporary_path, CURRENT_GENERATION_FILE)
+    # Keep the previous generation so workers that just read the old CURRENT can still open it.
+    # Older files are unlinked; workers that still map them keep their pages until they switch.
+    for file in os.listdir(GENERATIONS_DIRECTORY):
+        if file.startswith("inventory-") and file.endswith(".bin"):
+            if int(file[len("inventory-"):-len(".bin")]) < generation - 1:
+                try:
+                    os.remove(os.path.join(GENERATIONS_DIRECTORY, file))
+                except OSError:
+                    logging.warning(f"Could not remove old inventory generation {file}.")
 
 # --- Utility Functions ---
 
-def load_inventory():
-    """Load all CSV reference inventory files from DATA_DIRECTORY into a single DataFrame."""
-    global inventory_dataframe
+def load_inventory(only_if_stale=False):
+    """
+    Load all CSV reference inventory files from DATA_DIRECTORY and publish them as a
+    new shared inventory generation. With only_if_stale, skip the rebuild when the
+    current generation was already built from the same CSV files. Returns False if
+    the generation could not be built.
+    """
     try:
-        csv_files = [
-            os.path.join(DATA_DIRECTORY, file)
-            for file in os.listdir(DATA_DIRECTORY) if file.endswith('.csv')
-        ]
-        dataframe_list = []
-        for file in csv_files:
-            try:
-                dataframe = pd.read_csv(file)
-                dataframe_list.append(dataframe)
-            except Exception as exception:
-                logging.error(f"Error reading {file}: {exception}")
-        if dataframe_list:
-            inventory_dataframe = pd.concat(dataframe_list, ignore_index=True)
-            logging.info(f"Loaded inventory with {len(inventory_dataframe)} rows from {len(csv_files)} files.")
-        else:
-            inventory_dataframe = pd.DataFrame()
+        with _generation_lock():
+            source = _inventory_source()
+            current = _read_current_generation()
+            if only_if_stale and current is not None:
+                try:
+                    if InventoryGeneration(_generation_path(current[0])).source == source:
+                        return True
+                except Exception as exception:
+                    logging.error(f"Error reading inventory generation {current[0]}: {exception}")
+
+            dataframe_list = []
+            for file, _, _ in source:
+                try:
+                    dataframe = pd.read_csv(os.path.join(DATA_DIRECTORY, file))
+                    dataframe_list.append(dataframe)
+                except Exception as exception:
+                    logging.error(f"Error reading {file}: {exception}")
+            if dataframe_list:
+                inventory_dataframe = pd.concat(dataframe_list, ignore_index=True)
+            else:
+                inventory_dataframe = pd.DataFrame()
+
+            generation = current[0] + 1 if current is not None else 1
+            build_id = uuid.uuid4().hex
+            _write_inventory_generation(inventory_dataframe, generation, build_id, source, _generation_path(generation))
+            _publish_generation(generation, build_id)
+            logging.info(
+                f"Published inventory generation {generation} with {len(inventory_dataframe)} rows "
+                f"from {len(source)} files."
+            )
+        return True
     except Exception as exception:
         logging.exception("Failed to load inventory.")
-        inventory_dataframe = pd.DataFrame()
+        return False
 
-# Load inventory on startup.
-load_inventory()
+def get_inventory():
+    """
+    Return the shared reference inventory generation, switching to a newer one when
+    another worker has published it. Until a worker has attached to a generation,
+    each call rebuilds it if the CSV files have changed, so a failed first build is
+    retried on the next request rather than cached as an empty inventory.
+    """
+    global inventory_generation
+    if inventory_generation is None:
+        load_inventory(only_if_stale=True)
+    current = _read_current_generation()
+    if current is not None and (inventory_generation is None or current[1] != inventory_generation.build_id):
+        try:
+            inventory_generation = InventoryGeneration(_generation_path(current[0]))
+        except Exception as exception:
+            logging.exception("Failed to open inventory generation %s.", current[0])
+    if inventory_generation is None:
+        return InventoryGeneration()
+    return inventory_generation
 
 def save_scanned_data():
     """Save the current campaign's scanned data to a CSV file in CAMPAIGNS_DIRECTORY."""
@@ -125,14 +389,13 @@ def get_campaign_statistics():
     }
 
 # --- Global Error Handler ---
-@app.errorhandler(Exception)
 def handle_exception(exception):
     logging.exception("Unhandled Exception: %s", exception)
     return render_template("error.html", error=str(exception)), 500
 
 # --- Routes ---
 
-@app.route('/', methods=['GET', 'POST'])
+@main.route('/', methods=['GET', 'POST'])
 def index():
     """
     Home page:
@@ -143,8 +406,7 @@ def index():
     """
     try:
         unique_count = 0
-        if not inventory_dataframe.empty and "Barcode ID - Container" in inventory_dataframe.columns:
-            unique_count = inventory_dataframe["Barcode ID - Container"].nunique()
+        unique_count = get_inventory().unique_barcode_count
 
         if request.method == 'POST':
             if 'start_campaign' in request.form:
@@ -165,16 +427,17 @@ def index():
                     "barcode", "timestamp", "building", "room", "location", "category"
                 ])
                 archive_campaign()  # Save the new (empty) campaign file.
-                return redirect(url_for('campaign'))
+                return redirect(url_for('.campaign'))
             elif 'upload_inventory' in request.form:
                 file = request.files.get('inventory_file')
                 if file and file.filename.endswith('.csv'):
                     filepath = os.path.join(DATA_DIRECTORY, file.filename)
                     file.save(filepath)
-                    flash("Inventory CSV uploaded successfully.", "success")
-                    load_inventory()  # Reload reference database.
-                    if not inventory_dataframe.empty and "Barcode ID - Container" in inventory_dataframe.columns:
-                        unique_count = inventory_dataframe["Barcode ID - Container"].nunique()
+                    if load_inventory():  # Reload reference database.
+                        flash("Inventory CSV uploaded successfully.", "success")
+                    else:
+                        flash("Inventory CSV uploaded, but the inventory could not be reloaded.", "danger")
+                    unique_count = get_inventory().unique_barcode_count
                 else:
                     flash("Invalid file or no file selected for inventory.", "danger")
             elif 'upload_campaign' in request.form:
@@ -191,8 +454,8 @@ def index():
         flash("An error occurred in the index route.", "danger")
         return render_template("index.html", unique_count=unique_count)
 
-@app.route('/campaign')
-@app.route('/campaign/<campaign_id>')
+@main.route('/campaign')
+@main.route('/campaign/<campaign_id>')
 def campaign(campaign_id=None):
     if campaign_id:
         session['campaign_id'] = campaign_id
@@ -202,12 +465,12 @@ def campaign(campaign_id=None):
             scanned_dataframe = pd.read_csv(file_path)
         else:
             flash("Campaign file not found.", "danger")
-            return redirect(url_for('index'))
+            return redirect(url_for('.index'))
     else:
         campaign_id = session.get('campaign_id')
         if not campaign_id:
             flash("No active campaign. Please start a new campaign.", "warning")
-            return redirect(url_for('index'))
+            return redirect(url_for('.index'))
     campaign_info = {
         "building": session.get('building', ''),
         "room": session.get('room', ''),
@@ -216,7 +479,7 @@ def campaign(campaign_id=None):
     }
     return render_template("campaign.html", campaign=campaign_info)
 
-@app.route('/scan', methods=['POST'])
+@main.route('/scan', methods=['POST'])
 def scan():
     try:
         data = request.get_json()
@@ -224,7 +487,7 @@ def scan():
         if not barcode:
             return jsonify({"success": False, "message": "No barcode provided."}), 400
 
-        global scanned_dataframe, inventory_dataframe
+        global scanned_dataframe
 
         # Check for duplicate scan by looking at the 'barcode' column in scanned_dataframe.
         if not scanned_dataframe.empty and barcode in scanned_dataframe["barcode"].values:
@@ -241,14 +504,12 @@ def scan():
         timestamp = datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
 
         # Look up the barcode in the reference inventory.
-        matched = pd.DataFrame()
-        if not inventory_dataframe.empty and "Barcode ID - Container" in inventory_dataframe.columns:
-            matched = inventory_dataframe[inventory_dataframe["Barcode ID - Container"].astype(str) == barcode]
+        matched = get_inventory().lookup(barcode)
 
         # Determine the category.
-        if not matched.empty:
-            statuses = matched["Status - Container"].astype(str).str.lower()
-            if any(statuses == "archived"):
+        if matched:
+            statuses = [str(row.get("Status - Container")).lower() for row in matched]
+            if "archived" in statuses:
                 category = "archived"
             else:
                 category = "active"
@@ -276,8 +537,8 @@ def scan():
         }
 
         # If reference data is found, merge the first matching row into new_entry.
-        if not matched.empty:
-            reference_data = matched.iloc[0].to_dict()
+        if matched:
+            reference_data = dict(matched[0])
             # Remove any redundant keys from the reference data.
             for redundant_key in ["building", "room", "location"]:
                 if redundant_key in reference_data:
@@ -326,16 +587,16 @@ def scan():
             "category": category,
             "inventory_data": []  # Will hold reference data if available.
         }
-        if not matched.empty:
-            response["inventory_data"] = [matched.iloc[0].to_dict()]
+        if matched:
+            response["inventory_data"] = [matched[0]]
         response["campaign_statistics"] = campaign_statistics
 
         return jsonify(response)
     except Exception as exception:
-        app.logger.exception("Error processing scan.")
+        current_app.logger.exception("Error processing scan.")
         return jsonify({"success": False, "message": "Internal server error during scan."}), 500
 
-@app.route('/api/scanned_data')
+@main.route('/api/scanned_data')
 def api_scanned_data():
     """Return the current campaign's scanned data as JSON (for AG Grid)."""
     try:
@@ -348,7 +609,7 @@ def api_scanned_data():
         logging.exception("Error fetching scanned data.")
         return jsonify([])
 
-@app.route('/download')
+@main.route('/download')
 def download():
     """Download the active campaign CSV."""
     try:
@@ -359,13 +620,13 @@ def download():
                 return send_file(file_path, as_attachment=True)
             else:
                 flash("Campaign file not found.", "danger")
-        return redirect(url_for('campaign'))
+        return redirect(url_for('.campaign'))
     except Exception as exception:
         logging.exception("Error during download.")
         flash("Error during download.", "danger")
-        return redirect(url_for('campaign'))
+        return redirect(url_for('.campaign'))
 
-@app.route('/download_campaign/<campaign_id>')
+@main.route('/download_campaign/<campaign_id>')
 def download_campaign(campaign_id):
     """Download an archived campaign CSV (by campaign_id)."""
     try:
@@ -374,13 +635,13 @@ def download_campaign(campaign_id):
             return send_file(file_path, as_attachment=True)
         else:
             flash("Campaign file not found.", "danger")
-            return redirect(url_for('campaign_history'))
+            return redirect(url_for('.campaign_history'))
     except Exception as exception:
         logging.exception("Error downloading campaign %s", campaign_id)
         flash("Error during download.", "danger")
-        return redirect(url_for('campaign_history'))
+        return redirect(url_for('.campaign_history'))
 
-@app.route('/campaign_history')
+@main.route('/campaign_history')
 def campaign_history():
     try:
         campaigns_list = []
@@ -392,7 +653,7 @@ def campaign_history():
                 try:
                     dataframe = pd.read_csv(file_path)
                 except Exception as exception:
-                    app.logger.exception("Error reading campaign file %s", file)
+                    current_app.logger.exception("Error reading campaign file %s", file)
                     continue  # Skip files that cannot be read
 
                 total_scanned = len(dataframe)
@@ -409,11 +670,11 @@ def campaign_history():
         campaigns_list.sort(key=lambda campaign: campaign["campaign_id"], reverse=True)
         return render_template("campaign_history.html", campaigns=campaigns_list)
     except Exception as exception:
-        app.logger.exception("Error loading campaign history.")
+        current_app.logger.exception("Error loading campaign history.")
         flash("Error loading campaign history.", "danger")
         return redirect('/')
 
-@app.route('/view_campaign/<campaign_id>')
+@main.route('/view_campaign/<campaign_id>')
 def view_campaign(campaign_id):
     """Display an archived campaign in a table along with a restart option."""
     try:
@@ -426,13 +687,13 @@ def view_campaign(campaign_id):
             return render_template("view_campaign.html", campaign_id=campaign_id, data=data, statistics=statistics)
         else:
             flash("Campaign file not found.", "danger")
-            return redirect(url_for('campaign_history'))
+            return redirect(url_for('.campaign_history'))
     except Exception as exception:
         logging.exception("Error viewing campaign %s", campaign_id)
         flash("Error viewing campaign.", "danger")
-        return redirect(url_for('campaign_history'))
+        return redirect(url_for('.campaign_history'))
 
-@app.route('/restart_campaign/<campaign_id>')
+@main.route('/restart_campaign/<campaign_id>')
 def restart_campaign(campaign_id):
     """
     Restart an archived campaign as the active campaign.
@@ -454,16 +715,16 @@ def restart_campaign(campaign_id):
             global scanned_dataframe
             scanned_dataframe = campaign_data  # Set the active campaign data.
             flash("Campaign restarted successfully.", "success")
-            return redirect(url_for('campaign'))
+            return redirect(url_for('.campaign'))
         else:
             flash("Campaign file not found.", "danger")
-            return redirect(url_for('campaign_history'))
+            return redirect(url_for('.campaign_history'))
     except Exception as exception:
         logging.exception("Error restarting campaign %s", campaign_id)
         flash("Error restarting campaign.", "danger")
-        return redirect(url_for('campaign_history'))
+        return redirect(url_for('.campaign_history'))
 
-@app.route('/copy_campaign/<campaign_id>')
+@main.route('/copy_campaign/<campaign_id>')
 def copy_campaign(campaign_id):
     """
     Create a new campaign as a copy of an existing one, with a new timestamp.
@@ -499,16 +760,16 @@ def copy_campaign(campaign_id):
             # Save the new campaign file
             save_scanned_data()
             flash("Campaign copied successfully.", "success")
-            return redirect(url_for('campaign'))
+            return redirect(url_for('.campaign'))
         else:
             flash("Campaign file not found.", "danger")
-            return redirect(url_for('campaign_history'))
+            return redirect(url_for('.campaign_history'))
     except Exception as exception:
         logging.exception("Error copying campaign %s", campaign_id)
         flash("Error copying campaign.", "danger")
-        return redirect(url_for('campaign_history'))
+        return redirect(url_for('.campaign_history'))
 
-@app.route('/upload_inventory', methods=['GET', 'POST'])
+@main.route('/upload_inventory', methods=['GET', 'POST'])
 def upload_inventory():
     """Route for uploading reference inventory CSV files."""
     try:
@@ -517,17 +778,19 @@ def upload_inventory():
             if file and file.filename.endswith('.csv'):
                 filepath = os.path.join(DATA_DIRECTORY, file.filename)
                 file.save(filepath)
-                flash("Inventory CSV uploaded successfully.", "success")
-                load_inventory()
+                if load_inventory():
+                    flash("Inventory CSV uploaded successfully.", "success")
+                else:
+                    flash("Inventory CSV uploaded, but the inventory could not be reloaded.", "danger")
             else:
                 flash("Invalid file uploaded.", "danger")
         return render_template("upload_inventory.html")
     except Exception as exception:
         logging.exception("Error uploading inventory CSV.")
         flash("Error uploading inventory CSV.", "danger")
-        return redirect(url_for('index'))
+        return redirect(url_for('.index'))
 
-@app.route('/upload_campaign', methods=['GET', 'POST'])
+@main.route('/upload_campaign', methods=['GET', 'POST'])
 def upload_campaign():
     """Route for uploading archived campaign CSV files."""
     try:
@@ -543,10 +806,10 @@ def upload_campaign():
     except Exception as exception:
         logging.exception("Error uploading campaign CSV.")
         flash("Error uploading campaign CSV.", "danger")
-        return redirect(url_for('index'))
+        return redirect(url_for('.index'))
 
 # Configuration route for editing the barcode regular expression.
-@app.route('/config', methods=['GET', 'POST'])
+@main.route('/config', methods=['GET', 'POST'])
 def config():
     """Display and allow updating of the barcode regular expression."""
     try:
@@ -558,15 +821,15 @@ def config():
                 CONFIGURATION["barcode_regex"] = new_regex
                 save_configuration()
                 flash("Barcode regex updated successfully.", "success")
-            return redirect(url_for('config'))
+            return redirect(url_for('.config'))
         return render_template("config.html", barcode_regex=CONFIGURATION.get("barcode_regex", ""))
     except Exception as exception:
         logging.exception("Error updating config.")
         flash("Error updating configuration.", "danger")
-        return redirect(url_for('index'))
+        return redirect(url_for('.index'))
 
 # Server status route to display uptime and log output.
-@app.route('/status')
+@main.route('/status')
 def status():
     """Display the server status and log output."""
     try:
@@ -575,41 +838,47 @@ def status():
                 logs = file.read()
         except Exception as exception:
             logs = "Error reading logs: " + str(exception)
-        uptime = datetime.datetime.now() - app_start_time
+        uptime = datetime.datetime.now() - current_app.config['START_TIME']
         return render_template("status.html", logs=logs, uptime=uptime)
     except Exception as exception:
         logging.exception("Error displaying server status.")
         flash("Error displaying server status.", "danger")
-        return redirect(url_for('index'))
+        return redirect(url_for('.index'))
 
 # New: Database browser route.
-@app.route('/database')
+@main.route('/database')
 def view_database():
     """
     View and filter the currently loaded reference inventory database using AG Grid.
     """
     try:
-        if inventory_dataframe.empty:
+        inventory = get_inventory()
+        if inventory.empty:
             data = []
         else:
-            data = inventory_dataframe.to_dict(orient='records')
+            data = inventory.to_records()
         return render_template("database.html", data=data)
     except Exception as exception:
         logging.exception("Error viewing database.")
         flash("Error viewing database.", "danger")
-        return redirect(url_for('index'))
+        return redirect(url_for('.index'))
 
-@app.route('/generate_barcodes/<campaign_id>')
+@main.route('/generate_barcodes/<campaign_id>')
 def generate_barcodes(campaign_id):
     """Generate a PDF of barcodes for selected items."""
     try:
+        from barcode import Code128
+        from barcode.writer import ImageWriter
+        from reportlab.pdfgen import canvas
+        from reportlab.lib.pagesizes import letter
+
         barcodes = request.args.get('barcodes', '').split(',')
         if not barcodes:
             flash("No barcodes selected.", "warning")
-            return redirect(url_for('view_campaign', campaign_id=campaign_id))
+            return redirect(url_for('.view_campaign', campaign_id=campaign_id))
 
         # Create a temporary directory for barcode images
-        temporary_directory = os.path.join(app.root_path, 'temp')
+        temporary_directory = os.path.join(current_app.root_path, 'temp')
         os.makedirs(temporary_directory, exist_ok=True)
 
         # Generate PDF with barcodes
@@ -650,9 +919,9 @@ def generate_barcodes(campaign_id):
     except Exception as exception:
         logging.exception("Error generating barcodes")
         flash("Error generating barcodes.", "danger")
-        return redirect(url_for('view_campaign', campaign_id=campaign_id))
+        return redirect(url_for('.view_campaign', campaign_id=campaign_id))
 
-@app.route('/delete_campaign/<campaign_id>', methods=['DELETE'])
+@main.route('/delete_campaign/<campaign_id>', methods=['DELETE'])
 def delete_campaign(campaign_id):
     """Delete a campaign and its associated file."""
     try:
@@ -672,5 +941,51 @@ def delete_campaign(campaign_id):
         logging.exception("Error deleting campaign %s", campaign_id)
         return jsonify({"success": False, "message": str(exception)}), 500
 
+# --- Application Factory ---
+
+def create_app(preload_inventory=False):
+    """
+    Build and configure the Flask application.
+
+    The reference inventory is attached on first use rather than at startup. Workers
+    map the shared inventory generation and only rebuild it when the CSV files have
+    changed. Pass preload_inventory=True (e.g. `gunicorn --preload
+    'app:create_app(preload_inventory=True)'`) to do that check once in the gunicorn
+    master before workers are forked.
+    """
+    app = Flask(__name__)
+    app.secret_key = 'supersecretkey'  # Change this for production
+
+    # Record the app start time for uptime calculation
+    app.config['START_TIME'] = datetime.datetime.now()
+
+    # Configure logging: All messages will be written to app.log
+    logging.basicConfig(
+        level=logging.INFO,
+        filename='app.log',
+        format='%(asctime)s %(levelname)s: %(message)s'
+    )
+
+    # Ensure required folders exist
+    for folder in [DATA_DIRECTORY, CAMPAIGNS_DIRECTORY, UPLOADS_DIRECTORY, GENERATIONS_DIRECTORY]:
+        os.makedirs(folder, exist_ok=True)
+
+    load_configuration()
+
+    app.register_blueprint(main)
+    app.register_error_handler(Exception, handle_exception)
+
+    if preload_inventory:
+        get_inventory()
+    return app
+
+def __getattr__(name):
+    """Build the module-level `app` on first access so `gunicorn app:app` keeps working."""
+    if name == 'app':
+        global app
+        app = create_app()
+        return app
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
 if __name__ == '__main__':
-    app.run(debug=True, host='0.0.0.0')
+    create_app().run(debug=True, host='0.0.0.0')
@@ -0,0 +1,179 @@
+import math
+import os
+import subprocess
+import sys
+
+import pandas as pd
+import pytest
+
+import app
+
+
+@pytest.fixture
+def inventory_directories(tmp_path, monkeypatch):
+    """Point the inventory directories at tmp_path and reset the attached generation."""
+    data_directory = tmp_path / "data"
+    generations_directory = tmp_path / "inventory_generations"
+    data_directory.mkdir()
+    generations_directory.mkdir()
+    monkeypatch.setattr(app, "DATA_DIRECTORY", str(data_directory))
+    monkeypatch.setattr(app, "GENERATIONS_DIRECTORY", str(generations_directory))
+    monkeypatch.setattr(app, "CURRENT_GENERATION_FILE", str(generations_directory / "CURRENT"))
+    monkeypatch.setattr(app, "inventory_generation", None)
+    return data_directory, generations_directory
+
+
+def write_generation(tmp_path, dataframe):
+    path = str(tmp_path / "inventory-000001.bin")
+    app._write_inventory_generation(dataframe, 1, "build", [], path)
+    return app.InventoryGeneration(path)
+
+
+def test_round_trip_preserves_values_and_nulls(tmp_path):
+    dataframe = pd.DataFrame({
+        "Barcode ID - Container": ["A1", "B2"],
+        "Status - Container": ["Active", None],
+        "Current Quantity - Container": [2.5, float("nan")],
+        "Count": [1, 2],
+        "Note": ["é", "x"],
+    })
+    generation = write_generation(tmp_path, dataframe)
+
+    assert generation.row_count == 2
+    assert generation.unique_barcode_count == 2
+    assert generation.columns == list(dataframe.columns)
+    records = generation.to_records()
+    assert records[0] == {
+        "Barcode ID - Container": "A1",
+        "Status - Container": "Active",
+        "Current Quantity - Container": 2.5,
+        "Count": 1,
+        "Note": "é",
+    }
+    assert records[1]["Status - Container"] is None
+    assert math.isnan(records[1]["Current Quantity - Container"])
+    assert generation.lookup("A1") == [records[0]]
+    matched = generation.lookup("B2")
+    assert len(matched) == 1
+    assert matched[0]["Status - Container"] is None
+    assert math.isnan(matched[0]["Current Quantity - Container"])
+    assert generation.lookup("C3") == []
+    assert generation.lookup("A1-MUCH-LONGER-THAN-ANY-KEY") == []
+
+
+def test_duplicate_barcodes_return_in_file_order(tmp_path):
+    dataframe = pd.DataFrame({
+        "Barcode ID - Container": ["B", "A", "B", "A"],
+        "Status - Container": ["first", "x", "second", "y"],
+    })
+    generation = write_generation(tmp_path, dataframe)
+
+    assert [row["Status - Container"] for row in generation.lookup("B")] == ["first", "second"]
+    assert [row["Status - Container"] for row in generation.lookup("A")] == ["x", "y"]
+    assert generation.unique_barcode_count == 2
+
+
+def test_missing_barcodes_are_indexed(inventory_directories):
+    data_directory, _ = inventory_directories
+    (data_directory / "inventory.csv").write_text(
+        "Barcode ID - Container,Status - Container\nA1,Active\n,Active\nA2,Archived\n"
+    )
+
+    assert app.load_inventory()
+    generation = app.get_inventory()
+    assert generation.row_count == 3
+    assert generation.unique_barcode_count == 2
+    assert generation.lookup("A2")[0]["Status - Container"] == "Archived"
+    assert generation.lookup("nan")[0]["Barcode ID - Container"] is None
+
+
+def test_missing_numeric_barcodes_are_indexed(tmp_path):
+    dataframe = pd.DataFrame({"Barcode ID - Container": [12345.0, float("nan")]})
+    generation = write_generation(tmp_path, dataframe)
+
+    assert generation.row_count == 2
+    assert generation.unique_barcode_count == 1
+    assert len(generation.lookup("12345.0")) == 1
+    assert len(generation.lookup("nan")) == 1
+
+
+def test_header_only_csv(inventory_directories):
+    data_directory, _ = inventory_directories
+    (data_directory / "inventory.csv").write_text("Barcode ID - Container,Status - Container\n")
+
+    assert app.load_inventory()
+    generation = app.get_inventory()
+    assert generation.empty
+    assert generation.columns == ["Barcode ID - Container", "Status - Container"]
+    assert generation.lookup("A1") == []
+    assert generation.to_records() == []
+
+
+def test_empty_data_directory(inventory_directories):
+    generation = app.get_inventory()
+    assert generation.empty
+    assert generation.generation == 1
+    assert generation.unique_barcode_count == 0
+    assert generation.lookup("A1") == []
+
+
+def test_failed_first_build_is_retried(inventory_directories, monkeypatch):
+    data_directory, _ = inventory_directories
+    (data_directory / "inventory.csv").write_text("Barcode ID - Container\nA1\n")
+    write = app._write_inventory_generation
+
+    def failing_write(*arguments):
+        raise OSError("disk full")
+
+    monkeypatch.setattr(app, "_write_inventory_generation", failing_write)
+    assert app.get_inventory().empty
+    assert app.inventory_generation is None
+
+    monkeypatch.setattr(app, "_write_inventory_generation", write)
+    assert len(app.get_inventory().lookup("A1")) == 1
+
+
+def test_publish_keeps_previous_generation(inventory_directories):
+    _, generations_directory = inventory_directories
+    for _ in range(3):
+        assert app.load_inventory()
+
+    files = sorted(file for file in os.listdir(generations_directory) if file.endswith(".bin"))
+    assert files == ["inventory-000002.bin", "inventory-000003.bin"]
+    assert app._read_current_generation()[0] == 3
+
+
+def test_switches_after_numbering_restarts(inventory_directories):
+    data_directory, generations_directory = inventory_directories
+    (data_directory / "inventory.csv").write_text("Barcode ID - Container\nA1\n")
+    old_generation = app.get_inventory()
+    assert old_generation.generation == 1
+
+    for file in os.listdir(generations_directory):
+        os.remove(generations_directory / file)
+    (data_directory / "inventory.csv").write_text("Barcode ID - Container\nB2\n")
+    assert app.load_inventory()
+
+    new_generation = app.get_inventory()
+    assert new_generation.generation == 1
+    assert new_generation.build_id != old_generation.build_id
+    assert len(new_generation.lookup("B2")) == 1
+
+
+def test_switches_to_generation_published_by_another_process(inventory_directories, tmp_path):
+    data_directory, _ = inventory_directories
+    (data_directory / "inventory.csv").write_text("Barcode ID - Container\nA1\n")
+    assert app.get_inventory().lookup("NEW1") == []
+
+    (data_directory / "extra.csv").write_text("Barcode ID - Container\nNEW1\n")
+    repository_directory = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    subprocess.run(
+        [sys.executable, "-c", "import sys; sys.path.insert(0, sys.argv[1]); import app; assert app.load_inventory()",
+         repository_directory],
+        cwd=tmp_path,
+        check=True,
+    )
+
+    generation = app.get_inventory()
+    assert generation.generation == 2
+    assert len(generation.lookup("NEW1")) == 1